@@ -4,11 +4,34 @@ MAIN APPLICATION FILE
 This connects all layers together and runs the dashboard
 """
 
+import io
 import streamlit as st
 from model import SupermarketModel
 from view import SupermarketView
 from template import DashboardTemplate
 
+# How many different uploads stay loaded in memory at once
+UPLOAD_CACHE_SIZE = 3
+
+@st.cache_resource(show_spinner=False, max_entries=UPLOAD_CACHE_SIZE)
+def load_view(file_bytes):
+    """
+    Load, clean and analyze an uploaded file ONCE
+    Streamlit reruns this script on every click, so the result is cached
+    by the file contents - the same upload is never parsed twice
+    Only the last few uploads are kept, so old ones don't pile up in memory
+    Returns None if the file could not be loaded
+    """
+    # STEP 1: Initialize Model (Data Layer)
+    model = SupermarketModel()
+    
+    # STEP 2: Load and Clean Data (straight from memory, no temp file)
+    if not model.load_csv_from_buffer(io.BytesIO(file_bytes)):
+        return None
+    
+    # STEP 3: Initialize View (Business Logic Layer)
+    return SupermarketView(model)
+
 def main():
     """
     Main function - Entry point of the application
@@ -72,34 +95,27 @@ def main():
     
     # Main content area
     if uploaded_file is not None: 
-        # Save uploaded file temporarily
-        with open("temp_data.csv", "wb") as f: 
-            f.write(uploaded_file.getbuffer())
-        
         # Show loading spinner
         with st.spinner("🔄 Loading and processing data..."):
             try:
-                # STEP 1: Initialize Model (Data Layer)
-                model = SupermarketModel()
+                # STEP 1-3: Model + View (cached, only built for a new file)
+                view = load_view(uploaded_file.getvalue())
                 
-                # STEP 2: Load and Clean Data
-                success = model.load_csv("temp_data.csv")
-                
-                if success:
+                if view is not None:
                     # Display data summary
-                    summary = model.get_summary()
+                    # (sales total comes from the memoized KPIs - nothing
+                    # is summed again on a rerun)
+                    model = view.model
+                    kpis = view.get_kpis()
                     
                     with st.sidebar:
                         st.success("✅ Data loaded successfully!")
                         st.markdown("### 📋 Data Summary")
-                        st.write(f"Total Records: **{summary['total_rows']:,}**")
-                        st.write(f"Total Sales: **${summary['total_sales']:,.2f}**")
-                        st.write(f"Branches: **{summary['branches']}**")
-                        st.write(f"Cities: **{summary['cities']}**")
-                        st.write(f"Product Lines: **{summary['product_lines']}**")
-                    
-                    # STEP 3: Initialize View (Business Logic Layer)
-                    view = SupermarketView(model)
+                        st.write(f"Total Records: **{model.row_count:,}**")
+                        st.write(f"Total Sales: **${kpis['total_revenue']:,.2f}**")
+                        st.write(f"Branches: **{len(model.get_unique_values('Branch'))}**")
+                        st.write(f"Cities: **{len(model.get_unique_values('City'))}**")
+                        st.write(f"Product Lines: **{len(model.get_unique_values('Product line'))}**")
                     
                     # STEP 4: Initialize Template (UI Layer)
                     template = DashboardTemplate(view)
@@ -0,0 +1,39 @@
+#Compiled hot loops
+"""
+FAST LAYER - Compiled Calculations
+This file holds the few loops that run over every row:
+- Group-by sums (sales per branch, city, product, ...)
+
+If Numba is installed they are compiled to machine code. Without Numba
+the same answer comes from plain NumPy.
+"""
+
+import numpy as np
+
+try:
+    import numba
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+if HAVE_NUMBA:
+    @numba.njit(fastmath=True, cache=True)
+    def _groupby_sum_compiled(codes, values, n_groups):
+        """
+        One pass over the rows, adding each value into its group's total
+        values can be float32 or float64 - totals are always float64
+        """
+        totals = np.zeros(n_groups, dtype=np.float64)
+        for i in range(codes.shape[0]):
+            totals[codes[i]] += values[i]
+        return totals
+
+def groupby_sum(codes, values, n_groups):
+    """
+    Add up values for each group
+    Example: codes [0, 1, 0], values [10, 20, 30] -> [40, 20]
+    codes are the group numbers the model stores for category columns
+    """
+    if HAVE_NUMBA:
+        return _groupby_sum_compiled(codes, values, n_groups)
+    return np.bincount(codes, weights=values, minlength=n_groups)
\ No newline at end of file
@@ -8,6 +8,31 @@ This file handles all data operations:
 """
 
 import numpy as np
+import pandas as pd
+import fast
+
+class GroupIndex:
+    """
+    Group numbers of one category column, ready for group-by
+    Built once after loading, so every group-by afterwards is a
+    single pass over small codes - never a rescan of text
+    """
+    
+    def __init__(self, codes, names):
+        """
+        codes: group number of every row (like [0, 2, 0, 1])
+        names: name behind each group number (like ['A', 'B', 'C'])
+        """
+        self.codes = codes
+        self.names = names
+        # Rows per group, counted once
+        self.counts = np.bincount(codes, minlength=len(names))
+    
+    def sum(self, values):
+        """Add up values (one per row) for each group"""
+        if len(self.names) == 0:
+            return np.zeros(0)  # no groups (column not in the file)
+        return fast.groupby_sum(self.codes, values, len(self.names))
 
 class SupermarketModel:
     """
@@ -17,64 +42,79 @@ class SupermarketModel:
     
     def __init__(self):
         """Initialize empty data storage"""
-        self.data = {}
+        self.df = pd.DataFrame()  # one table, one Numpy array per column
         self.headers = []
         self.row_count = 0
+        self.groups = {}  # category column -> GroupIndex
         
     def load_csv(self, filepath):
         """
-        Load CSV file and convert to Numpy arrays
+        Load CSV file into a pandas DataFrame
+        filepath can also be an open file or an in-memory buffer
         
         How it works:
-        1. Read file line by line
-        2. Split by comma
-        3. Store in arrays
+        1. Let pandas parse the whole file in C (much faster than a Python loop)
+        2. Keep every cell as text so cleaning works the same way
+        3. Keep the table - every column is already a Numpy array inside it
         """
         try:
-            # Read the file
-            with open(filepath, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
+            # Read the file in one go
+            # pandas reads it in chunks, never holding a list of every line
+            # na_filter=False -> empty or missing cells stay '' instead of NaN
+            #                    (no NaN check, no extra fill-in copy)
+            # index_col=False -> a comma at the end of every row doesn't
+            #                    turn the first column into the row labels
+            # usecols -> rows with extra values are cut to the header length
+            #            (short rows are filled with '')
+            n_columns = self._count_header_columns(filepath)
+            self.df = pd.read_csv(filepath, dtype=str, na_filter=False,
+                                  encoding='utf-8', index_col=False,
+                                  usecols=range(n_columns))
             
-            # First line is headers (column names)
-            self.headers = lines[0].strip().split(',')
+            # Column names (strip stray spaces/newlines like before)
+            self.df.columns = [header.strip() for header in self.df.columns]
+            self.headers = list(self.df.columns)
             
-            # Initialize dictionary to store each column
-            for header in self.headers:
-                self.data[header] = []
-            
-            # Read data rows (skip header)
-            for line in lines[1:]:
-                values = line.strip().split(',')
-                
-                # Store each value in its column
-                for i, header in enumerate(self.headers):
-                    if i < len(values):
-                        self.data[header].append(values[i])
-                    else:
-                        self.data[header].append('')  # Empty if missing
-            
-            self.row_count = len(lines) - 1
+            self.row_count = len(self.df)
             print(f"✅ Loaded {self.row_count} rows successfully!")
             
-            # Convert to numpy arrays
-            self._convert_to_numpy()
-            
             # Clean the data
             self._clean_data()
             
+            if self.row_count == 0:
+                print("❌ No usable rows left after cleaning")
+                return False
+            
             return True
             
         except Exception as e:
             print(f"❌ Error loading CSV: {e}")
             return False
     
-    def _convert_to_numpy(self):
+    def _count_header_columns(self, filepath):
         """
-        Convert lists to Numpy arrays
-        Numpy arrays are faster and better for calculations
+        Count the columns in the first line (the headers)
+        An open file or buffer is put back where it was, so pandas
+        still reads it from the start
         """
-        for header in self.headers:
-            self.data[header] = np.array(self.data[header])
+        if hasattr(filepath, 'readline'):
+            start = filepath.tell()
+            header_line = filepath.readline()
+            filepath.seek(start)
+        else:
+            with open(filepath, 'r', encoding='utf-8') as file:
+                header_line = file.readline()
+        
+        if isinstance(header_line, bytes):
+            header_line = header_line.decode('utf-8')
+        return len(header_line.strip().split(','))
+    
+    def load_csv_from_buffer(self, buffer):
+        """
+        Load CSV data that is already in memory (like an uploaded file)
+        Skips saving it to disk and reading it back
+        """
+        return self.load_csv(buffer)
     
     def _clean_data(self):
         """
@@ -88,75 +128,120 @@ class SupermarketModel:
         important_columns = ['Total', 'Quantity', 'Rating', 'Branch']
         
         # Find rows where important data is missing
-        valid_rows = np.ones(self.row_count, dtype=bool)  # Start with all True
+        # (one combined AND over all columns instead of one & per column)
+        not_empty = [self.df[col].to_numpy() != '' for col in important_columns
+                     if col in self.df]
         
-        for col in important_columns:
-            if col in self.data:
-                # Mark rows as invalid if empty
-                valid_rows = valid_rows & (self.data[col] != '')
+        if not_empty:
+            valid_rows = np.logical_and.reduce(not_empty)
+        else:
+            valid_rows = np.ones(self.row_count, dtype=bool)  # Nothing to check
         
         # Count removed rows
-        removed = self.row_count - np.sum(valid_rows)
+        kept = int(np.count_nonzero(valid_rows))
+        removed = self.row_count - kept
         
         if removed > 0:
             print(f"⚠️ Removed {removed} rows with missing data")
-            # Keep only valid rows
-            for header in self.headers:
-                self.data[header] = self.data[header][valid_rows]
-            self.row_count = np.sum(valid_rows)
+            # Keep only valid rows (one filter for the whole table)
+            self.df = self.df[valid_rows].reset_index(drop=True)
+            self.row_count = kept
         else:
             print("✅ No missing data found!")
         
         # Convert numeric columns from text to numbers
-        numeric_columns = ['Unit price', 'Quantity', 'Tax 5%', 'Total', 
-                          'cogs', 'gross margin percentage', 'gross income', 'Rating']
+        # Use the smallest type that fits so every calculation reads less memory:
+        # float32 (4 bytes) for prices and ratings, int16 (2 bytes) for item counts
+        # (item counts move to int64 if a value is too big for int16)
+        numeric_columns = {
+            'Unit price': np.float32, 'Quantity': np.int16, 'Tax 5%': np.float32,
+            'Total': np.float32, 'cogs': np.float32,
+            'gross margin percentage': np.float32, 'gross income': np.float32,
+            'Rating': np.float32
+        }
+        
+        for col, dtype in numeric_columns.items():
+            if col in self.df:
+                self.df[col] = self._safe_convert_to_number(self.df[col].to_numpy(),
+                                                            dtype)
         
-        for col in numeric_columns:
-            if col in self.data:
-                # Convert to float (decimal numbers)
-                self.data[col] = self._safe_convert_to_float(self.data[col])
+        # Prepare the category columns for fast grouping
+        self._build_group_index()
         
         print(f"✅ Final dataset: {self.row_count} clean rows\n")
     
-    def _safe_convert_to_float(self, arr):
-        """
-        Safely convert text numbers to float
-        If conversion fails, use 0.0
-        """
-        result = np.zeros(len(arr), dtype=float)
-        for i, val in enumerate(arr):
-            try:
-                result[i] = float(val)
-            except:
-                result[i] = 0.0
-        return result
+    def _build_group_index(self):
+        """
+        Store text columns with only a few different values as small codes
+        Example: Branch ['A', 'C', 'A'] -> codes [0, 1, 0] + names ['A', 'C']
+        1 byte per row instead of a Python string, and faster to compare
+        Each column also gets a GroupIndex, so grouping never rescans it
+        """
+        category_columns = ['Branch', 'City', 'Customer type', 'Gender',
+                            'Payment', 'Product line']
+        
+        for col in category_columns:
+            if col in self.df:
+                codes, names = pd.factorize(self.df[col].to_numpy(), sort=True)
+                codes = codes.astype(np.min_scalar_type(len(names)))
+                self.df[col] = codes
+                self.groups[col] = GroupIndex(codes, names)
+    
+    def _safe_convert_to_number(self, arr, dtype=float):
+        """
+        Safely convert text numbers to numbers of the given dtype
+        If conversion fails, use 0
+        Integer dtypes (like np.int16) round to whole numbers; if a value
+        doesn't fit, the whole column is kept as int64 instead
+        (pandas converts the whole column at once instead of one value at a time)
+        """
+        # to_numeric already returns a brand new array, so the failed
+        # values (NaN) are replaced in place instead of copying it again
+        result = np.asarray(pd.to_numeric(arr, errors='coerce'), dtype=float)
+        
+        if np.issubdtype(dtype, np.integer):
+            result[~np.isfinite(result)] = 0.0  # inf can't be a whole number
+            result = np.rint(result)
+            limits = np.iinfo(dtype)
+            if result.size and (result.min() < limits.min or result.max() > limits.max):
+                dtype = np.int64  # too big for the small type - don't wrap around
+        else:
+            result[np.isnan(result)] = 0.0
+        
+        return result.astype(dtype, copy=False)
     
     def get_column(self, column_name):
-        """Get a specific column"""
-        return self.data.get(column_name, np.array([]))
+        """
+        Get a specific column
+        Category columns (Branch, City, ...) come back as codes -
+        get_unique_values() gives the name behind each code
+        """
+        if column_name not in self.df:
+            return np.array([])
+        return self.df[column_name].to_numpy()
     
     def get_unique_values(self, column_name):
         """Get unique values from a column (like unique branches: A, B, C)"""
-        return np.unique(self.data.get(column_name, np.array([])))
+        if column_name in self.groups:
+            return self.groups[column_name].names
+        return np.unique(self.get_column(column_name))
     
-    def filter_by_value(self, column_name, value):
+    def get_group_index(self, column_name):
         """
-        Filter data by a specific value
-        Example: Get all sales from Branch A
+        Get the GroupIndex of a category column (like Branch)
+        A column that isn't in the file gives an empty GroupIndex (no groups)
         """
-        mask = self.data[column_name] == value
-        filtered_data = {}
-        for header in self.headers:
-            filtered_data[header] = self.data[header][mask]
-        return filtered_data
+        if column_name not in self.groups:
+            return GroupIndex(np.array([], dtype=np.uint8), np.array([], dtype=object))
+        return self.groups[column_name]
     
     def get_summary(self):
         """Get basic statistics about the dataset"""
         return {
             'total_rows': self.row_count,
-            'total_sales': np.sum(self.data['Total']),
-            'average_rating': np.mean(self.data['Rating']),
-            'total_quantity': np.sum(self.data['Quantity']),
+            'total_sales': np.sum(self.get_column('Total'), dtype=np.float64),
+            'average_rating': np.mean(self.get_column('Rating'), dtype=np.float64),
+            'total_quantity': np.sum(self.get_column('Quantity')),
             'branches': len(self.get_unique_values('Branch')),
             'cities': len(self.get_unique_values('City')),
             'product_lines': len(self.get_unique_values('Product line'))
@@ -7,9 +7,95 @@ This file creates the dashboard that users see:
 - Interactions
 """
 
+import io
 import streamlit as st
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------------------
+# CHART BUILDERS
+# Streamlit reruns the whole script on every click. Drawing a
+# Matplotlib figure and turning it into a PNG is slow, so each chart
+# is drawn once per data and only the finished PNG bytes are cached.
+# Reruns just send those bytes again with st.image, and no Figure is
+# ever shared between users. Arguments are tuples (hashable) so
+# Streamlit can use them as the cache key.
+# Figures are created with Figure() instead of plt.subplots(), so
+# pyplot never tracks them - no plt.close() needed. Only the last few
+# images per chart are kept, so old uploads don't pile up in memory.
+# Plain bar and line charts don't need Matplotlib at all - they use
+# Streamlit's own charts, which the browser draws.
+# ------------------------------------------------------------------
+
+CHART_CACHE_SIZE = 10
+
+def _to_png(fig):
+    """Draw a figure into PNG bytes (same settings st.pyplot uses)"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_SIZE)
+def _pie_png(labels, sales, colors, title):
+    """Pie chart of each group's share of sales"""
+    fig = Figure(figsize=(5, 4))
+    ax = fig.subplots()
+    ax.pie(sales, labels=labels, autopct='%1.1f%%',
+           startangle=90, colors=colors)
+    ax.set_title(title)
+    fig.tight_layout()
+    return _to_png(fig)
+
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_SIZE)
+def _payment_png(methods, counts):
+    """Pie chart of payment methods"""
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    colors = ['#74B9FF', '#A29BFE', '#FD79A8']
+    wedges, texts, autotexts = ax.pie(
+        counts, 
+        labels=methods, 
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=colors,
+        explode=[0.05] * len(methods)
+    )
+    # Make percentage text bold
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+    ax.set_title('Payment Method Distribution', fontsize=14, fontweight='bold')
+    fig.tight_layout()
+    return _to_png(fig)
+
+@st.cache_data(show_spinner=False, max_entries=CHART_CACHE_SIZE)
+def _rating_png(rating_ranges, hist):
+    """Histogram bars of customer ratings"""
+    fig = Figure(figsize=(12, 5))
+    ax = fig.subplots()
+    colors = plt.cm.RdYlGn(np.linspace(0.3, 0.9, len(hist)))
+    bars = ax.bar(rating_ranges, hist, color=colors, edgecolor='black')
+    
+    ax.set_xlabel('Rating Range', fontsize=12)
+    ax.set_ylabel('Number of Transactions', fontsize=12)
+    ax.set_title('Customer Rating Distribution', fontsize=14, fontweight='bold')
+    ax.tick_params(axis='x', rotation=45)
+    ax.grid(True, alpha=0.3, axis='y')
+    
+    # Add value labels
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{int(height)}', ha='center', va='bottom')
+    
+    fig.tight_layout()
+    return _to_png(fig)
+
+def _as_key(values):
+    """Turn a Numpy array into a tuple of plain Python values (cache key)"""
+    return tuple(np.asarray(values).tolist())
 
 class DashboardTemplate:
     """
@@ -100,50 +186,24 @@ class DashboardTemplate:
             # Sales by Branch
             st.markdown("#### Sales by Branch")
             branches, sales = self.view.get_sales_by_branch()
-            fig, ax = plt.subplots(figsize=(6, 4))
-            colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
-            ax.bar(branches, sales, color=colors)
-            ax.set_ylabel('Total Sales ($)')
-            ax.set_title('Branch Performance')
-            # Add value labels on bars
-            for i, v in enumerate(sales):
-                ax.text(i, v, f'${v:,.0f}', ha='center', va='bottom')
-            plt.tight_layout()
-            st.pyplot(fig)
+            st.bar_chart(pd.DataFrame({'Total Sales ($)': sales}, index=branches),
+                         color='#4ECDC4')
         
         with col2:
             # Sales by City
             st.markdown("#### Sales by City")
             cities, sales = self.view.get_sales_by_city()
-            fig, ax = plt.subplots(figsize=(6, 4))
-            colors = ['#95E1D3', '#F38181', '#FCE77D']
-            ax.bar(cities, sales, color=colors)
-            ax.set_ylabel('Total Sales ($)')
-            ax.set_title('City Performance')
-            plt.xticks(rotation=15)
-            for i, v in enumerate(sales):
-                ax.text(i, v, f'${v:,.0f}', ha='center', va='bottom')
-            plt.tight_layout()
-            st.pyplot(fig)
+            st.bar_chart(pd.DataFrame({'Total Sales ($)': sales}, index=cities),
+                         color='#F38181')
         
         st.markdown("---")
         
         # Top Products
         st.markdown("#### Top 5 Product Lines")
         products, sales = self.view.get_top_products(top_n=5)
-        
-        fig, ax = plt.subplots(figsize=(10, 5))
-        colors = plt.cm.Spectral(np.linspace(0.2, 0.8, len(products)))
-        bars = ax.barh(products, sales, color=colors)
-        ax.set_xlabel('Total Sales ($)')
-        ax.set_title('Best Selling Product Categories')
-        
-        # Add value labels
-        for i, v in enumerate(sales):
-            ax.text(v, i, f'  ${v:,.0f}', va='center')
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        # sort=False keeps the best seller on top
+        st.bar_chart(pd.DataFrame({'Total Sales ($)': sales}, index=products),
+                     horizontal=True, sort=False, color='#45B7D1')
     
     def _render_customer_insights(self):
         """Show customer behavior analysis"""
@@ -155,94 +215,38 @@ class DashboardTemplate:
             # Customer Type
             st.markdown("#### Member vs Normal Customers")
             ctypes, sales, counts = self.view.get_customer_type_analysis()
-            
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
-            
-            # Sales comparison
-            colors = ['#6C5CE7', '#00B894']
-            ax1.pie(sales, labels=ctypes, autopct='%1.1f%%', 
-                    startangle=90, colors=colors)
-            ax1.set_title('Sales by Customer Type')
-            
-            # Transaction count
-            ax2.bar(ctypes, counts, color=colors)
-            ax2.set_ylabel('Number of Transactions')
-            ax2.set_title('Transaction Count')
-            for i, v in enumerate(counts):
-                ax2.text(i, v, str(v), ha='center', va='bottom')
-            
-            plt.tight_layout()
-            st.pyplot(fig)
+            colors = ('#6C5CE7', '#00B894')
+            st.image(_pie_png(_as_key(ctypes), _as_key(sales), colors,
+                              'Sales by Customer Type'), width='stretch')
+            st.bar_chart(pd.DataFrame({'Number of Transactions': counts},
+                                      index=ctypes), color=colors[0])
         
         with col2:
             # Gender Analysis
             st.markdown("#### Gender Distribution")
             genders, sales, counts = self.view.get_gender_analysis()
-            
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
-            
-            # Sales by gender
-            colors = ['#A29BFE', '#FD79A8']
-            ax1.pie(sales, labels=genders, autopct='%1.1f%%',
-                    startangle=90, colors=colors)
-            ax1.set_title('Sales by Gender')
-            
-            # Count by gender
-            ax2.bar(genders, counts, color=colors)
-            ax2.set_ylabel('Number of Purchases')
-            ax2.set_title('Purchase Count')
-            for i, v in enumerate(counts):
-                ax2.text(i, v, str(v), ha='center', va='bottom')
-            
-            plt.tight_layout()
-            st.pyplot(fig)
+            colors = ('#A29BFE', '#FD79A8')
+            st.image(_pie_png(_as_key(genders), _as_key(sales), colors,
+                              'Sales by Gender'), width='stretch')
+            st.bar_chart(pd.DataFrame({'Number of Purchases': counts},
+                                      index=genders), color=colors[0])
         
         st.markdown("---")
         
         # Payment Methods
         st.markdown("#### Payment Method Preferences")
         methods, counts = self.view.get_payment_method_distribution()
-        
-        fig, ax = plt.subplots(figsize=(8, 5))
-        colors = ['#74B9FF', '#A29BFE', '#FD79A8']
-        wedges, texts, autotexts = ax.pie(
-            counts, 
-            labels=methods, 
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colors,
-            explode=[0.05] * len(methods)
-        )
-        # Make percentage text bold
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-        ax.set_title('Payment Method Distribution', fontsize=14, fontweight='bold')
-        plt.tight_layout()
-        st.pyplot(fig)
+        st.image(_payment_png(_as_key(methods), _as_key(counts)), width='stretch')
     
     def _render_trends(self):
         """Show sales trends over time"""
         st.subheader("Sales Trends")
         
         months, sales = self.view.get_monthly_sales_trend()
-        
-        fig, ax = plt.subplots(figsize=(12, 5))
-        ax.plot(months, sales, marker='o', linewidth=2, 
-                markersize=8, color='#6C5CE7')
-        ax.fill_between(range(len(months)), sales, alpha=0.3, color='#6C5CE7')
-        ax.set_xlabel('Month', fontsize=12)
-        ax.set_ylabel('Total Sales ($)', fontsize=12)
-        ax.set_title('Monthly Sales Trend', fontsize=14, fontweight='bold')
-        ax.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        
-        # Add value labels
-        for i, v in enumerate(sales):
-            ax.text(i, v, f'${v:,.0f}', ha='center', va='bottom')
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        # Ordered categories keep the months in calendar order (not A-Z)
+        month_index = pd.CategoricalIndex(months, categories=months, ordered=True)
+        st.line_chart(pd.DataFrame({'Total Sales ($)': sales}, index=month_index),
+                      x_label='Month', color='#6C5CE7')
         
         # Additional metrics
         col1, col2, col3 = st.columns(3)
@@ -270,38 +274,17 @@ class DashboardTemplate:
         for i in range(len(bin_edges)-1):
             rating_ranges.append(f"{bin_edges[i]:.1f}-{bin_edges[i+1]:.1f}")
         
-        fig, ax = plt.subplots(figsize=(12, 5))
-        colors = plt.cm.RdYlGn(np.linspace(0.3, 0.9, len(hist)))
-        bars = ax.bar(rating_ranges, hist, color=colors, edgecolor='black')
-        
-        ax.set_xlabel('Rating Range', fontsize=12)
-        ax.set_ylabel('Number of Transactions', fontsize=12)
-        ax.set_title('Customer Rating Distribution', fontsize=14, fontweight='bold')
-        plt.xticks(rotation=45)
-        ax.grid(True, alpha=0.3, axis='y')
-        
-        # Add value labels
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height)}', ha='center', va='bottom')
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+        st.image(_rating_png(tuple(rating_ranges), _as_key(hist)), width='stretch')
         
         # Rating summary
-        kpis = self.view.get_kpis()
+        summary = self.view.get_rating_summary()
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("⭐ Average Rating", f"{kpis['average_rating']:.2f}/10")
+            st.metric("⭐ Average Rating", f"{summary['average_rating']:.2f}/10")
         
         with col2:
-            # Calculate percentage of high ratings (>7)
-            ratings = self.view.view.model.get_column('Rating')
-            high_ratings = np.sum(ratings > 7)
-            pct = (high_ratings / len(ratings)) * 100
-            st.metric("👍 High Ratings (>7)", f"{pct:.1f}%")
+            st.metric("👍 High Ratings (>7)", f"{summary['high_rating_pct']:.1f}%")
         
         with col3:
-            st.metric("📊 Total Ratings", f"{len(ratings):,}")
\ No newline at end of file
+            st.metric("📊 Total Ratings", f"{summary['total_ratings']:,}")
\ No newline at end of file
@@ -7,7 +7,26 @@ This file processes data for visualization:
 - Aggregations
 """
 
+import functools
 import numpy as np
+import pandas as pd
+
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+
+def remember(method):
+    """
+    Remember what a method returned so it is only calculated once
+    The model never changes after loading, so the answer never changes
+    (a new file means a new model and a new view)
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._results:
+            self._results[key] = method(self, *args, **kwargs)
+        return self._results[key]
+    return wrapper
 
 class SupermarketView:
     """
@@ -18,86 +37,51 @@ class SupermarketView:
     def __init__(self, model):
         """Connect to the model (data source)"""
         self.model = model
+        self._results = {}  # answers saved by @remember
+    
+    @remember
+    def _sales_by(self, column_name):
+        """Sum the Total column for each group of a column"""
+        groups = self.model.get_group_index(column_name)
+        return groups.names, groups.sum(self.model.get_column('Total'))
+    
+    def _counts_by(self, column_name):
+        """Count the rows in each group of a column"""
+        groups = self.model.get_group_index(column_name)
+        return groups.names, groups.counts
     
     def get_sales_by_branch(self):
         """
         Calculate total sales for each branch
         Returns: branch names and their sales
         """
-        branches = self.model.get_unique_values('Branch')
-        sales = []
-        
-        for branch in branches:
-            # Filter data for this branch
-            branch_data = self.model.filter_by_value('Branch', branch)
-            # Sum all sales for this branch
-            total = np.sum(branch_data['Total'])
-            sales.append(total)
-        
-        return branches, np.array(sales)
+        return self._sales_by('Branch')
     
     def get_sales_by_city(self):
         """Calculate total sales for each city"""
-        cities = self.model.get_unique_values('City')
-        sales = []
-        
-        for city in cities:
-            city_data = self.model.filter_by_value('City', city)
-            total = np.sum(city_data['Total'])
-            sales.append(total)
-        
-        return cities, np.array(sales)
+        return self._sales_by('City')
     
     def get_sales_by_product_line(self):
         """Calculate sales for each product category"""
-        products = self.model.get_unique_values('Product line')
-        sales = []
-        
-        for product in products:
-            product_data = self.model.filter_by_value('Product line', product)
-            total = np.sum(product_data['Total'])
-            sales.append(total)
-        
-        return products, np.array(sales)
+        return self._sales_by('Product line')
     
     def get_payment_method_distribution(self):
         """Count how many times each payment method was used"""
-        methods = self.model.get_unique_values('Payment')
-        counts = []
-        
-        for method in methods:
-            method_data = self.model.filter_by_value('Payment', method)
-            count = len(method_data['Payment'])
-            counts.append(count)
-        
-        return methods, np.array(counts)
+        return self._counts_by('Payment')
     
     def get_customer_type_analysis(self):
         """Compare Member vs Normal customers"""
-        customer_types = self.model.get_unique_values('Customer type')
-        sales = []
-        counts = []
-        
-        for ctype in customer_types:
-            ctype_data = self.model.filter_by_value('Customer type', ctype)
-            sales.append(np.sum(ctype_data['Total']))
-            counts.append(len(ctype_data['Total']))
-        
-        return customer_types, np.array(sales), np.array(counts)
+        customer_types, sales = self._sales_by('Customer type')
+        _, counts = self._counts_by('Customer type')
+        return customer_types, sales, counts
     
     def get_gender_analysis(self):
         """Compare Male vs Female purchases"""
-        genders = self.model.get_unique_values('Gender')
-        sales = []
-        counts = []
-        
-        for gender in genders:
-            gender_data = self.model.filter_by_value('Gender', gender)
-            sales.append(np.sum(gender_data['Total']))
-            counts.append(len(gender_data['Total']))
-        
-        return genders, np.array(sales), np.array(counts)
+        genders, sales = self._sales_by('Gender')
+        _, counts = self._counts_by('Gender')
+        return genders, sales, counts
     
+    @remember
     def get_rating_distribution(self):
         """
         Create rating histogram
@@ -106,13 +90,22 @@ class SupermarketView:
         ratings = self.model.get_column('Rating')
         
         # Create bins for ratings (4.0-4.5, 4.5-5.0, etc.)
-        bins = np.arange(4.0, 10.5, 0.5)
+        bin_edges = np.arange(4.0, 10.5, 0.5)
+        n_bins = len(bin_edges) - 1
+        
+        # Bins are all 0.5 wide, so a rating's bin number is just
+        # (rating - 4.0) * 2 rounded down - no searching through edges
+        # Ratings outside 4.0-10.0 are ignored, 10.0 goes in the last bin
+        in_range = (ratings >= bin_edges[0]) & (ratings <= bin_edges[-1])
+        bin_index = ((ratings[in_range] - bin_edges[0]) * 2).astype(np.int64)
+        bin_index = np.minimum(bin_index, n_bins - 1)
         
         # Count how many ratings fall in each bin
-        hist, bin_edges = np.histogram(ratings, bins=bins)
+        hist = np.bincount(bin_index, minlength=n_bins)
         
         return bin_edges, hist
     
+    @remember
     def get_monthly_sales_trend(self):
         """
         Calculate sales for each month
@@ -121,78 +114,95 @@ class SupermarketView:
         dates = self.model.get_column('Date')
         totals = self.model.get_column('Total')
         
-        # Dictionary to store: month -> total sales
-        monthly_sales = {}
-        
-        for i, date in enumerate(dates):
-            # Extract month from date (format: 1/5/2019 -> month is 1)
-            try:
-                month = date.split('/')[0]
-                if month not in monthly_sales:
-                    monthly_sales[month] = 0
-                monthly_sales[month] += totals[i]
-            except:
-                continue
-        
-        # Sort by month number
-        months = sorted(monthly_sales.keys(), key=lambda x: int(x))
-        sales = [monthly_sales[m] for m in months]
-        
-        # Convert month numbers to names
-        month_names = []
-        month_map = {
-            '1': 'January', '2': 'February', '3': 'March',
-            '4': 'April', '5': 'May', '6': 'June',
-            '7': 'July', '8': 'August', '9': 'September',
-            '10': 'October', '11': 'November', '12': 'December'
-        }
+        if len(dates) != len(totals):
+            return [], np.array([])  # no Date (or Total) column
+        
+        # Extract month from every date at once (format: 1/5/2019 -> month is 1)
+        # Only the part before the first '/' is read, so 1/5/19 or
+        # 1/5/2019 13:08 work too. Anything that isn't a month 1-12 is skipped
+        month_text = pd.Series(dates, dtype=object).str.partition('/')[0]
+        months = pd.to_numeric(month_text, errors='coerce').to_numpy(dtype=float)
+        valid = (months >= 1) & (months <= 12) & (months % 1 == 0)
+        months = months[valid].astype(np.int64)
         
-        for m in months:
-            month_names.append(month_map.get(m, m))
+        # Add up sales per month number (index 1 = January ... 12 = December)
+        monthly_sales = np.bincount(months, weights=totals[valid], minlength=13)
         
-        return month_names, np.array(sales)
+        # Keep only the months that appear in the data, in calendar order
+        present = np.flatnonzero(np.bincount(months, minlength=13))
+        month_names = [MONTH_NAMES[m - 1] for m in present]
+        
+        return month_names, monthly_sales[present]
     
+    @remember
     def get_top_products(self, top_n=5):
         """Get top N selling products"""
         products, sales = self.get_sales_by_product_line()
         
-        # Sort by sales (descending)
-        sorted_indices = np.argsort(sales)[::-1]
+        # Get top N without sorting everything:
+        # argpartition only moves the N biggest to the end (no full sort)
+        top_indices = np.arange(len(sales))
+        if 0 < top_n < len(sales):
+            top_indices = np.argpartition(sales, -top_n)[-top_n:]
+        
+        # Sort just those N by sales (descending)
+        top_indices = top_indices[np.argsort(sales[top_indices])[::-1]][:top_n]
         
-        # Get top N
-        top_products = products[sorted_indices[:top_n]]
-        top_sales = sales[sorted_indices[:top_n]]
+        top_products = products[top_indices]
+        top_sales = sales[top_indices]
         
         return top_products, top_sales
     
+    @remember
+    def get_rating_summary(self):
+        """
+        Rating numbers shown under the rating chart
+        High rating = above 7 out of 10
+        """
+        ratings = self.model.get_column('Rating')
+        total = len(ratings)
+        
+        return {
+            'average_rating': self.get_kpis()['average_rating'],
+            'high_rating_pct': 100.0 * np.count_nonzero(ratings > 7) / total,
+            'total_ratings': total
+        }
+    
     def get_average_basket_size(self):
         """
         Calculate average quantity per transaction
         Shows how many items customers buy on average
         """
-        quantities = self.model.get_column('Quantity')
-        return np.mean(quantities)
+        kpis = self.get_kpis()
+        return kpis['total_items_sold'] / kpis['total_transactions']
     
     def get_average_transaction_value(self):
         """Average amount spent per transaction"""
-        totals = self.model.get_column('Total')
-        return np.mean(totals)
+        return self.get_kpis()['average_transaction']
     
+    @remember
     def get_kpis(self):
         """
         KPI = Key Performance Indicator
         Important metrics for business dashboard
+        Each column is summed once - averages reuse those sums
+        Sums are added up in float64 so adding many float32 values
+        doesn't pile up extra rounding error (each stored value is
+        already rounded to float32 precision)
         """
         totals = self.model.get_column('Total')
         quantities = self.model.get_column('Quantity')
         ratings = self.model.get_column('Rating')
         
+        count = len(totals)
+        total_revenue = np.sum(totals, dtype=np.float64)
+        
         return {
-            'total_revenue': np.sum(totals),
-            'total_transactions': len(totals),
-            'average_transaction': np.mean(totals),
+            'total_revenue': total_revenue,
+            'total_transactions': count,
+            'average_transaction': total_revenue / count,
             'total_items_sold': np.sum(quantities),
-            'average_rating': np.mean(ratings),
+            'average_rating': np.sum(ratings, dtype=np.float64) / len(ratings),
             'max_transaction': np.max(totals),
             'min_transaction': np.min(totals)
         }
\ No newline at end of file